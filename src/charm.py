@@ -7,7 +7,10 @@
 
 """Chrony charm."""
 
+import hashlib
+import json
 import logging
+import re
 import typing
 
 import ops
@@ -19,10 +22,28 @@ from keychain import TlsKeychain
 
 logger = logging.getLogger(__name__)
 
+_CONFIG_LIST_SEPARATOR = re.compile(r"\s*,\s*")
 
-class ChronyCharm(ops.CharmBase):
+
+def _secret_unique_id(secret_id: str) -> str:
+    """Get the unique identifier part of a juju secret URI.
+
+    Juju may refer to the same secret as ``secret:<id>`` or ``secret://<model-uuid>/<id>``.
+
+    Args:
+        secret_id: The juju secret URI.
+
+    Returns:
+        The unique identifier of the secret.
+    """
+    return secret_id.rsplit("/", 1)[-1].removeprefix("secret:")
+
+
+class ChronyCharm(ops.CharmBase):  # pylint: disable=too-many-instance-attributes
     """Charm the service."""
 
+    _stored = ops.StoredState()
+
     def __init__(self, *args: typing.Any):
         """Construct.
 
@@ -30,7 +51,12 @@ class ChronyCharm(ops.CharmBase):
             args: Arguments passed to the CharmBase parent constructor.
         """
         super().__init__(*args)
+        self._stored.set_default(config_hash="")
         self.chrony = Chrony()
+        self._config_cache: dict[str, typing.Any] = {}
+        self._time_sources_cache: tuple[str, list[TimeSource]] | None = None
+        self._nts_secret_cache: dict[str, TlsKeyPair] = {}
+        self._renewed_csr: tuple[str, str] | None = None
         self.certificates = tls_certificates.TLSCertificatesRequiresV3(self, "nts-certificates")
         self.tls_keychain = TlsKeychain(namespace="nts-certificates")
         self._grafana_agent = COSAgentProvider(
@@ -41,7 +67,7 @@ class ChronyCharm(ops.CharmBase):
             dashboard_dirs=["./src/grafana_dashboards"],
         )
         self.framework.observe(self.on.install, self._on_install)
-        self.framework.observe(self.on.upgrade_charm, self._on_upgrade_charm)
+        self.framework.observe(self.on.upgrade_charm, self._on_install)
         self.framework.observe(self.on.config_changed, self._on_config_changed)
         self.framework.observe(self.on.secret_changed, self._on_secret_changed)
         self.framework.observe(
@@ -87,10 +113,12 @@ class ChronyCharm(ops.CharmBase):
 
     def _on_certificate_expiring(self, _: ops.EventBase) -> None:
         """Handle the certificates expiring event."""
+        self._renewed_csr = None
         self._do_renew_certificate()
 
     def _on_certificate_invalidated(self, _: ops.EventBase) -> None:
         """Handle the certificates invalidated event."""
+        self._renewed_csr = None
         self._do_renew_certificate()
 
     def _do_renew_certificate(self) -> None:
@@ -111,47 +139,56 @@ class ChronyCharm(ops.CharmBase):
     def _renew_certificate(self) -> None:
         """Renew the certificate.
 
+        A renewal is skipped if the CSR in the TLS keychain is the one this charm instance
+        requested for the current server name, so it's only renewed once per server name unless
+        the keychain is cleared or the certificate expires or is invalidated.
+
         Raises:
             AssertionError: if there's no server name (canary exception).
         """
-        old_csr = self.tls_keychain.get_csr()
-        private_key = self.tls_keychain.get_private_key()
-        if not self._get_server_name():  # pragma: nocover
+        server_name = self._get_server_name()
+        if not server_name:  # pragma: nocover
             raise AssertionError("no server name")
+        if self._renewed_csr is not None and self._renewed_csr == (
+            server_name,
+            self.tls_keychain.get_csr(),
+        ):
+            return
+        old_csr = self.tls_keychain.get_csr_bytes()
+        private_key = self.tls_keychain.get_private_key_bytes()
         new_csr = tls_certificates.generate_csr(
-            private_key=private_key.encode(),
-            subject=self._get_server_name(),
-            sans_dns=[self._get_server_name(), f"*.{self._get_server_name()}"],
+            private_key=private_key,
+            subject=server_name,
+            sans_dns=[server_name, f"*.{server_name}"],
         )
         if not old_csr:
             self.certificates.request_certificate_creation(certificate_signing_request=new_csr)
         else:
             self.certificates.request_certificate_renewal(
-                old_certificate_signing_request=old_csr.encode(),
+                old_certificate_signing_request=old_csr,
                 new_certificate_signing_request=new_csr,
             )
-        self.tls_keychain.set_server_name(self._get_server_name())
-        self.tls_keychain.set_csr(new_csr.decode(encoding="ascii").strip())
+        csr = new_csr.decode(encoding="ascii").strip()
+        self.tls_keychain.set_server_name(server_name)
+        self.tls_keychain.set_csr(csr)
+        self._renewed_csr = (server_name, csr)
 
     def _revoke_certificate(self) -> None:
         """Renew the certificate."""
-        csr = self.tls_keychain.get_csr()
+        csr = self.tls_keychain.get_csr_bytes()
         if csr:
-            self.certificates.request_certificate_revocation(csr.encode())
+            self.certificates.request_certificate_revocation(csr)
         self.tls_keychain.clear()
 
     def _on_install(self, _: ops.EventBase) -> None:
-        """Handle install event."""
-        self._do_install()
+        """Handle install and upgrade-charm events.
 
-    def _on_upgrade_charm(self, _: ops.EventBase) -> None:
-        """Handle upgrade-charm event."""
-        self._do_install()
-
-    def _do_install(self) -> None:
-        """Install required packages and open NTP port."""
-        self.unit.status = ops.MaintenanceStatus("installing chrony")
-        self.chrony.install()
+        Install required packages if missing and open NTP port.
+        """
+        self._stored.config_hash = ""
+        if not self.chrony.is_installed():
+            self.unit.status = ops.MaintenanceStatus("installing chrony")
+            self.chrony.install()
         self.unit.open_port("udp", 123)
         if not self.tls_keychain.get_private_key():
             self.tls_keychain.set_private_key(
@@ -160,18 +197,43 @@ class ChronyCharm(ops.CharmBase):
 
     def _on_config_changed(self, _: ops.ConfigChangedEvent) -> None:
         """Handle the "config-changed" event."""
+        self._config_cache.clear()
+        self._nts_secret_cache.clear()
+        if self._get_config_hash() == self._stored.config_hash:
+            logger.info("Charm configuration unchanged, skip reconfiguration")
+            return
+        server_name = self._get_server_name()
+        relation = self.model.get_relation("nts-certificates")
         if (
-            self._get_server_name()
-            and self.model.get_relation("nts-certificates")
+            server_name
+            and relation
             and (
                 not self.tls_keychain.get_key_pairs()
-                or self.tls_keychain.get_server_name() != self._get_server_name()
+                or self.tls_keychain.get_server_name() != server_name
             )
         ):
             self._renew_certificate()
-        if not self._get_server_name() and self.tls_keychain.get_private_key():
+        if not server_name and self.tls_keychain.get_private_key():
             self._revoke_certificate()
         self._configure_chrony()
+        self._stored.config_hash = self._get_config_hash()
+
+    def _get_config_hash(self) -> str:
+        """Get a digest of the state that the "config-changed" handler acts on.
+
+        Returns:
+            The hex digest of the charm configuration and TLS keychain state.
+        """
+        state = [
+            self._get_config("sources"),
+            self._get_server_name(),
+            self._get_config("nts-certificates"),
+            self.tls_keychain.get_server_name(),
+            self.model.get_relation("nts-certificates") is not None,
+            bool(self.tls_keychain.get_key_pairs()),
+            bool(self.tls_keychain.get_private_key()),
+        ]
+        return hashlib.sha256(json.dumps(state).encode("utf-8")).hexdigest()
 
     def _on_secret_changed(self, event: ops.SecretChangedEvent) -> None:
         """Handle the "secret-changed" event for nts-certificates charm configuration.
@@ -179,9 +241,9 @@ class ChronyCharm(ops.CharmBase):
         Args:
             event: secret-changed event object.
         """
-        if typing.cast(str, event.secret.id) in typing.cast(
-            str, self.config.get("nts-certificates")
-        ):
+        changed = _secret_unique_id(typing.cast(str, event.secret.id))
+        self._nts_secret_cache.pop(changed, None)
+        if changed in self._get_nts_secret_ids():
             self._configure_chrony()
 
     def _configure_chrony(self) -> None:
@@ -195,13 +257,29 @@ class ChronyCharm(ops.CharmBase):
             self.unit.close_port("tcp", 4460)
         self.chrony.new_config(sources=sources, tls_key_pairs=self._get_nts_certificates()).apply()
 
+    def _get_config(self, key: str) -> typing.Any:
+        """Get a charm configuration value, cached for the rest of the hook.
+
+        The cache is cleared in the config-changed handler, the only point where the charm
+        configuration can change under a running charm instance.
+
+        Args:
+            key: The charm configuration option name.
+
+        Returns:
+            The charm configuration value.
+        """
+        if key not in self._config_cache:
+            self._config_cache[key] = self.config.get(key)
+        return self._config_cache[key]
+
     def _get_server_name(self) -> str | None:
         """Get server name from charm configuration.
 
         Returns:
             The server name, None if not configured.
         """
-        return typing.cast(str | None, self.config.get("server-name"))
+        return typing.cast(str | None, self._get_config("server-name"))
 
     def _get_time_sources(self) -> list[TimeSource]:
         """Get time sources from charm configuration.
@@ -209,10 +287,29 @@ class ChronyCharm(ops.CharmBase):
         Returns:
             Time source objects.
         """
-        urls = typing.cast(str, self.config.get("sources"))
-        return [
-            self.chrony.parse_source_url(url.strip()) for url in urls.split(",") if url.strip()
+        urls = typing.cast(str, self._get_config("sources"))
+        if self._time_sources_cache is not None and self._time_sources_cache[0] == urls:
+            return self._time_sources_cache[1]
+        sources = [
+            self.chrony.parse_source_url(url)
+            for url in _CONFIG_LIST_SEPARATOR.split(urls.strip())
+            if url
         ]
+        self._time_sources_cache = (urls, sources)
+        return sources
+
+    def _get_nts_secret_ids(self) -> dict[str, str]:
+        """Get juju secret IDs from the nts-certificates charm configuration.
+
+        Returns:
+            The configured secret IDs in configuration order, keyed by their unique identifier.
+        """
+        secret_ids = typing.cast(str, self._get_config("nts-certificates")).strip()
+        return {
+            _secret_unique_id(secret_id): secret_id
+            for secret_id in _CONFIG_LIST_SEPARATOR.split(secret_ids)
+            if secret_id
+        }
 
     def _get_nts_certificates(self) -> list[TlsKeyPair]:
         """Get TLS certificates for NTS from charm configuration and tls-certificate integration.
@@ -221,13 +318,14 @@ class ChronyCharm(ops.CharmBase):
             A list of TlsKeyPair objects.
         """
         certs = []
-        for secret_id in typing.cast(str, self.config.get("nts-certificates")).split(","):
-            secret_id = secret_id.strip()
-            if not secret_id:
-                continue
-            secret = self.model.get_secret(id=secret_id)
-            secret_value = secret.get_content(refresh=True)
-            certs.append(TlsKeyPair(certificate=secret_value["cert"], key=secret_value["key"]))
+        for unique_id, secret_id in self._get_nts_secret_ids().items():
+            if unique_id not in self._nts_secret_cache:
+                secret = self.model.get_secret(id=secret_id)
+                secret_value = secret.get_content(refresh=True)
+                self._nts_secret_cache[unique_id] = TlsKeyPair(
+                    certificate=secret_value["cert"], key=secret_value["key"]
+                )
+            certs.append(self._nts_secret_cache[unique_id])
         certs.extend(self.tls_keychain.get_key_pairs())
         return certs
 
@@ -6,31 +6,38 @@
 # check chrony.conf document for _PoolOptions attributes.
 # flake8: noqa: DCO060
 
-import collections
+import dataclasses
+import functools
+import grp
 import itertools
 import logging
+import os
 import pathlib
-import shutil
+import pwd
+import re
 import subprocess  # nosec
-import textwrap
 import typing
 import urllib.parse
 
 import pydantic
+import pydantic.dataclasses
 from charms.operator_libs_linux.v0 import apt
 from charms.operator_libs_linux.v1 import systemd
 
 logger = logging.getLogger(__name__)
 
+# Time sources are validated by pydantic on construction, while attribute access during
+# rendering stays plain slot access.
+_TIME_SOURCE_CONFIG = pydantic.ConfigDict(extra="forbid")
 
-class _PoolOptions(pydantic.BaseModel):
+
+@pydantic.dataclasses.dataclass(frozen=True, slots=True, kw_only=True, config=_TIME_SOURCE_CONFIG)
+class _PoolOptions:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
     """Chrony pool directive options.
 
     For more detail: https://chrony-project.org/doc/4.5/chrony.conf.html
     """
 
-    model_config = pydantic.ConfigDict(extra="forbid")
-
     minpoll: int | None = None
     maxpoll: int | None = None
     iburst: bool = False
@@ -69,19 +76,68 @@ class _PoolOptions(pydantic.BaseModel):
             Chrony pool directive option string.
         """
         options = []
-        # mypy and pylint have problems handling the model_fields class attribute.
-        # pylint: disable=not-an-iterable
-        for field in sorted(f for f in _PoolOptions.model_fields if f != "copy"):  # type: ignore
+        for field, is_flag in _POOL_OPTION_FIELDS:
             value = getattr(self, field)
-            if value is True:
+            if is_flag:
+                if value:
+                    options.append(field)
+            elif value is not None:
                 options.append(field)
-            elif value is None or value is False:
-                continue
-            else:
-                options.extend([field, str(value)])
+                options.append(str(value))
         return " ".join(options)
 
 
+# pool option names in rendering order, paired with whether the option is a flag
+_POOL_OPTION_FIELDS = tuple(
+    sorted((f.name, f.type is bool) for f in dataclasses.fields(_PoolOptions))
+)
+
+_SOURCE_URL_PATTERN = re.compile(
+    r"(?P<scheme>[a-z]+)://"
+    r"(?:[^@/?#]*@)?"
+    r"(?P<host>\[[0-9A-Fa-f:.]*\]|[A-Za-z0-9._-]*)"
+    r"(?::(?P<port>[0-9]*))?"
+    r"(?:/[^?#]*)?"
+    r"(?:\?(?P<query>[^#]*))?"
+    r"(?:#.*)?"
+)
+
+# whitespace and control characters would leak extra lines or tokens into chrony.conf
+_URL_INVALID_CHARS = re.compile(r"[\s\x00-\x1f\x7f]")
+
+# Options set from the URL authority, which must not be overridden from the query string.
+_URL_ADDRESS_KEYS = frozenset(("host", "port", "ntsport"))
+
+
+def _split_source_url(url: str, scheme: str) -> tuple[str | None, int | None, dict[str, str]]:
+    """Split a time source URL into host, port and query options in a single pass.
+
+    Args:
+        url: URL to split.
+        scheme: Expected URL scheme.
+
+    Returns:
+        A tuple of the host (None if empty), the port (None if not set) and the query options.
+
+    Raises:
+        ValueError: If the URL is invalid.
+    """
+    match = _SOURCE_URL_PATTERN.fullmatch(url)
+    if not match or match["scheme"] != scheme or _URL_INVALID_CHARS.search(url):
+        raise ValueError(f"Invalid {scheme.upper()} source URL: {url}")
+    host = match["host"].removeprefix("[").removesuffix("]").lower() or None
+    port = int(match["port"]) if match["port"] else None
+    if port is not None and port > 65535:
+        raise ValueError(f"Invalid {scheme.upper()} source URL: {url}")
+    query = dict(urllib.parse.parse_qsl(match["query"] or ""))
+    if query.keys() & _URL_ADDRESS_KEYS or any(
+        _URL_INVALID_CHARS.search(key + value) for key, value in query.items()
+    ):
+        raise ValueError(f"Invalid {scheme.upper()} source URL: {url}")
+    return host, port, query
+
+
+@pydantic.dataclasses.dataclass(frozen=True, slots=True, kw_only=True, config=_TIME_SOURCE_CONFIG)
 class _NtpSource(_PoolOptions):
     """A NTP time source."""
 
@@ -101,11 +157,8 @@ class _NtpSource(_PoolOptions):
         Raises:
             ValueError: If the URL is invalid.
         """
-        parsed = urllib.parse.urlparse(url)
-        if parsed.scheme != "ntp":
-            raise ValueError(f"Invalid NTP source URL: {url}")
-        query = dict(urllib.parse.parse_qsl(parsed.query))
-        return cls(host=parsed.hostname, port=parsed.port, **query)  # type: ignore
+        host, port, query = _split_source_url(url, "ntp")
+        return _NTP_SOURCE_VALIDATOR.validate_python({**query, "host": host, "port": port})
 
     def render(self) -> str:
         """Render NTP time source as a chrony pool directive string.
@@ -113,15 +166,17 @@ class _NtpSource(_PoolOptions):
         Returns:
             Chrony pool directive string.
         """
-        directive = f"pool {self.host}"
+        parts = ["pool", self.host]
         if self.port is not None and self.port != 123:
-            directive += f" port {self.port}"
+            parts.append("port")
+            parts.append(str(self.port))
         options = self.render_options()
         if options:
-            directive += f" {options}"
-        return directive
+            parts.append(options)
+        return " ".join(parts)
 
 
+@pydantic.dataclasses.dataclass(frozen=True, slots=True, kw_only=True, config=_TIME_SOURCE_CONFIG)
 class _NtsSource(_PoolOptions):
     """A NTP time source with NTS enabled."""
 
@@ -141,11 +196,8 @@ class _NtsSource(_PoolOptions):
         Raises:
             ValueError: If the URL is invalid.
         """
-        parsed = urllib.parse.urlparse(url)
-        if parsed.scheme != "nts":
-            raise ValueError(f"Invalid NTS source URL: {url}")
-        query = dict(urllib.parse.parse_qsl(parsed.query))
-        return cls(host=parsed.hostname, ntsport=parsed.port, **query)  # type: ignore
+        host, port, query = _split_source_url(url, "nts")
+        return _NTS_SOURCE_VALIDATOR.validate_python({**query, "host": host, "ntsport": port})
 
     def render(self) -> str:
         """Render NTP time source as a chrony pool directive string with NTS enabled.
@@ -153,17 +205,70 @@ class _NtsSource(_PoolOptions):
         Returns:
             Chrony pool directive string.
         """
-        directive = f"pool {self.host} nts"
+        parts = ["pool", self.host, "nts"]
         if self.ntsport is not None and self.ntsport != 4460:
-            directive += f" ntsport {self.ntsport}"
+            parts.append("ntsport")
+            parts.append(str(self.ntsport))
         options = self.render_options()
         if options:
-            directive += f" {options}"
-        return directive
+            parts.append(options)
+        return " ".join(parts)
+
 
+# the compiled pydantic-core validators, called directly to skip the TypeAdapter wrapper
+_NTP_SOURCE_VALIDATOR = pydantic.TypeAdapter(_NtpSource).validator
+_NTS_SOURCE_VALIDATOR = pydantic.TypeAdapter(_NtsSource).validator
 
 TimeSource = _NtpSource | _NtsSource
-TlsKeyPair = collections.namedtuple("TlsKeyPair", ["certificate", "key"])
+
+
+class TlsKeyPair(typing.NamedTuple):
+    """A TLS certificate and its private key.
+
+    Attributes:
+        certificate: The PEM-encoded certificate (chain).
+        key: The PEM-encoded private key.
+    """
+
+    certificate: str
+    key: str
+
+
+_STATIC_CONFIG = """\
+bindcmdaddress 127.0.0.1
+driftfile /var/lib/chrony/chrony.drift
+ntsdumpdir /var/lib/chrony
+logdir /var/log/chrony
+maxupdateskew 100.0
+rtcsync
+makestep 1 3
+leapsectz right/UTC
+allow 0.0.0.0/0
+allow ::/0
+"""
+
+
+@functools.lru_cache(maxsize=16)
+def _render_config(
+    sources: tuple[TimeSource, ...], certs_dir: pathlib.Path, num_tls_key_pairs: int
+) -> str:
+    """Generate the chrony configuration file content, memoized on its inputs.
+
+    Args:
+        sources: Chrony time sources.
+        certs_dir: The chrony TLS certificates directory.
+        num_tls_key_pairs: Number of TLS key pairs in the certificates directory.
+
+    Returns:
+        Generated chrony configuration file content.
+    """
+    rendered_sources = "\n".join(s.render() for s in sources)
+    certs_lines = []
+    for idx in range(num_tls_key_pairs):
+        certs_lines.append("ntsservercert " + str((certs_dir / f"{idx:04}.crt").absolute()))
+        certs_lines.append("ntsserverkey " + str((certs_dir / f"{idx:04}.key").absolute()))
+    certs = "\n".join(certs_lines)
+    return "\n\n".join(part for part in [rendered_sources, certs, _STATIC_CONFIG] if part)
 
 
 class _ChronyConfig:
@@ -192,64 +297,121 @@ class _ChronyConfig:
         Returns:
             Generated chrony configuration file content.
         """
-        sources = "\n".join(s.render() for s in self._sources)
-        certs_lines = []
-        for idx, _ in enumerate(self._tls_key_pairs):
-            certs_lines.append(
-                "ntsservercert " + str((self._chrony.CERTS_DIR / f"{idx:04}.crt").absolute())
-            )
-            certs_lines.append(
-                "ntsserverkey " + str((self._chrony.CERTS_DIR / f"{idx:04}.key").absolute())
-            )
-        certs = "\n".join(certs_lines)
-        static = textwrap.dedent(
-            """\
-                bindcmdaddress 127.0.0.1
-                driftfile /var/lib/chrony/chrony.drift
-                ntsdumpdir /var/lib/chrony
-                logdir /var/log/chrony
-                maxupdateskew 100.0
-                rtcsync
-                makestep 1 3
-                leapsectz right/UTC
-                allow 0.0.0.0/0
-                allow ::/0
-                """
+        return _render_config(
+            tuple(self._sources), self._chrony.CERTS_DIR, len(self._tls_key_pairs)
         )
-        return "\n\n".join(part for part in [sources, certs, static] if part)
 
     def apply(self) -> None:
         """Apply the new chrony configuration.
 
         This function compares the current chrony configuration with a new configuration. If they
         are the same, no changes are made. If they differ, the function updates the chrony
-        configuration file with the new settings and restarts the chrony service.
+        configuration file with the new settings and restarts the chrony service. Applying the
+        same sources and TLS key pairs again with the same Chrony object is a no-op.
         """
-        current_config = self._chrony.read_config()
-        current_certs = self._chrony.read_tls_key_pairs()
+        applied = (tuple(self._sources), tuple(self._tls_key_pairs))
+        if applied == self._chrony.last_applied:
+            return
         new_config = self.render()
-        if new_config != current_config or current_certs != self._tls_key_pairs:
+        # certificate files are only read when the configuration file itself is unchanged
+        if new_config != self._chrony.read_config() or self._chrony.tls_key_pairs_differ(
+            self._tls_key_pairs
+        ):
             logger.info("Chrony config changed, apply and restart chrony")
             self._chrony.write_tls_key_pairs(self._tls_key_pairs)
             self._chrony.write_config(new_config)
             self._chrony.restart()
+        self._chrony.last_applied = applied
+
+
+@functools.cache
+def _get_chrony_user_ids() -> tuple[int, int]:  # pragma: nocover
+    """Get the user ID and group ID of the chrony system user, resolved once per process.
+
+    Returns:
+        A tuple of the user ID and the group ID.
+    """
+    return pwd.getpwnam("_chrony").pw_uid, grp.getgrnam("_chrony").gr_gid
+
+
+def _read_file(path: pathlib.Path) -> str:
+    """Read a small text file, with a single read call if the file is read in full.
+
+    Falls back to reading until end of file on a short read, or if the file reports no size.
+
+    Args:
+        path: The path to the file.
+
+    Returns:
+        The content of the file.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        if size and len(data) == size:
+            return data.decode("utf-8")
+        chunks = [data]
+        while chunk := os.read(fd, max(size, 4096)):
+            chunks.append(chunk)
+        return b"".join(chunks).decode("utf-8")
+    finally:
+        os.close(fd)
+
+
+def _write_file(path: pathlib.Path, content: str, mode: int) -> None:
+    """Write a small text file, creating it with the given mode if it doesn't exist.
+
+    Args:
+        path: The path to the file.
+        content: The content to write to the file.
+        mode: The file mode used if the file is created.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        data = memoryview(content.encode("utf-8"))
+        while data:
+            data = data[os.write(fd, data) :]
+    finally:
+        os.close(fd)
 
 
 class Chrony:
-    """Chrony service manager."""
+    """Chrony service manager.
+
+    Attributes:
+        last_applied: The time sources and TLS key pairs of the last applied configuration.
+    """
 
     CONFIG_FILE = pathlib.Path("/etc/chrony/chrony.conf")
     CERTS_DIR = pathlib.Path("/etc/chrony/certs")
+    PACKAGES = ["chrony", "ca-certificates", "prometheus-chrony-exporter"]
 
-    @staticmethod
-    def install() -> None:  # pragma: nocover
+    def __init__(self) -> None:
+        """Initialize the chrony service manager."""
+        self.last_applied: tuple[tuple[TimeSource, ...], tuple[TlsKeyPair, ...]] | None = None
+
+    @classmethod
+    def install(cls) -> None:  # pragma: nocover
         """Install the Chrony on the system."""
         subprocess.check_call(
             ["add-apt-repository", "-y", "ppa:canonical-is-devops/chrony-charm"]
         )  # nosec
-        apt.add_package(
-            ["chrony", "ca-certificates", "prometheus-chrony-exporter"], update_cache=True
-        )
+        apt.add_package(cls.PACKAGES, update_cache=True)
+
+    @classmethod
+    def is_installed(cls) -> bool:  # pragma: nocover
+        """Check if all required packages are installed on the system.
+
+        Returns:
+            True if all required packages are installed, False otherwise.
+        """
+        for package in cls.PACKAGES:
+            try:
+                apt.DebianPackage.from_installed_package(package)
+            except apt.PackageNotFoundError:
+                return False
+        return True
 
     def read_config(self) -> str:
         """Read the current chrony configuration file.
@@ -257,7 +419,7 @@ class Chrony:
         Returns:
             The current chrony configuration file content.
         """
-        return self.CONFIG_FILE.read_text(encoding="utf-8")  # pragma: nocover
+        return _read_file(self.CONFIG_FILE)  # pragma: nocover
 
     def write_config(self, config: str) -> None:
         """Write the chrony configuration file.
@@ -265,12 +427,12 @@ class Chrony:
         Args:
             config: The new chrony configuration file content.
         """
-        self.CONFIG_FILE.write_text(config, encoding="utf-8")  # pragma: nocover
+        _write_file(self.CONFIG_FILE, config, mode=0o644)  # pragma: nocover
 
     def _make_certs_dir(self) -> None:  # pragma: nocover
         """Create the chrony TLS certificates directory."""
         self.CERTS_DIR.mkdir(exist_ok=True, mode=0o700)
-        shutil.chown(self.CERTS_DIR, "_chrony", "_chrony")
+        os.chown(self.CERTS_DIR, *_get_chrony_user_ids())
 
     def _iter_certs_dir(self) -> list[pathlib.Path]:  # pragma: nocover
         """Iterate over all certificate files in the certificate directory.
@@ -278,7 +440,12 @@ class Chrony:
         Returns:
             An iterator over the paths of the certificate files.
         """
-        return [f for f in self.CERTS_DIR.iterdir() if f.suffix in {".crt", ".key"}]
+        with os.scandir(self.CERTS_DIR) as entries:
+            return [
+                pathlib.Path(entry.path)
+                for entry in entries
+                if entry.name.endswith((".crt", ".key")) and entry.is_file()
+            ]
 
     @staticmethod
     def _write_certs_file(path: pathlib.Path, content: str) -> None:  # pragma: nocover
@@ -288,9 +455,8 @@ class Chrony:
             path: The path to the certificate file.
             content: The content to write to the file.
         """
-        path.touch(mode=0o600, exist_ok=True)
-        path.write_text(content, encoding="utf-8")
-        shutil.chown(path, "_chrony", "_chrony")
+        _write_file(path, content, mode=0o600)
+        os.chown(path, *_get_chrony_user_ids())
 
     @staticmethod
     def _read_certs_file(path: pathlib.Path) -> str:
@@ -302,7 +468,35 @@ class Chrony:
         Returns:
             The content of the certificate file as a string.
         """
-        return path.read_text(encoding="utf-8")  # pragma: nocover
+        return _read_file(path)  # pragma: nocover
+
+    @staticmethod
+    def _get_certs_file_size(path: pathlib.Path) -> int:
+        """Get the size of a certificate file in bytes.
+
+        Args:
+            path: The path to the certificate file.
+
+        Returns:
+            The size of the certificate file in bytes.
+        """
+        return path.stat().st_size  # pragma: nocover
+
+    def _certs_file_matches(self, path: pathlib.Path, content: str) -> bool:
+        """Check if a certificate file has the given content.
+
+        The file size is compared first so that files of a different size are not read.
+
+        Args:
+            path: The path to the certificate file.
+            content: The expected content of the certificate file.
+
+        Returns:
+            True if the certificate file has the given content, False otherwise.
+        """
+        if self._get_certs_file_size(path) != len(content.encode("utf-8")):
+            return False
+        return self._read_certs_file(path) == content
 
     @staticmethod
     def _unlink_certs_file(path: pathlib.Path) -> None:
@@ -331,33 +525,59 @@ class Chrony:
             )
         return key_pairs
 
+    def tls_key_pairs_differ(self, key_pairs: list[TlsKeyPair]) -> bool:
+        """Check if the TLS key pairs in the certificates directory differ from the given ones.
+
+        The number of files is compared first, then each key pair is compared with its indexed
+        file names, and certificate files are only read until the first difference is found.
+
+        Args:
+            key_pairs: A list of TlsKeyPair objects to compare with.
+
+        Returns:
+            True if the TLS key pairs differ, False otherwise.
+        """
+        self._make_certs_dir()
+        existing = {file.name for file in self._iter_certs_dir()}
+        if len(existing) != 2 * len(key_pairs):
+            return True
+        for idx, key_pair in enumerate(key_pairs):
+            for name, content in (
+                (f"{idx:04}.crt", key_pair.certificate),
+                (f"{idx:04}.key", key_pair.key),
+            ):
+                if name not in existing:
+                    return True
+                if not self._certs_file_matches(self.CERTS_DIR / name, content):
+                    return True
+        return False
+
     def write_tls_key_pairs(self, key_pairs: list[TlsKeyPair]) -> None:
         """Write TLS key pairs to the certificates directory.
 
-        Existing pairs are overwritten, and if more files exist than new key pairs provided,
-        the excess files are removed.
+        Each key pair is written to its indexed file name, files whose content already matches
+        are left untouched, and any other file in the directory is removed. All comparisons are
+        done before the certificates directory is modified.
 
         Args:
             key_pairs: A list of TlsKeyPair objects to write.
         """
         self._make_certs_dir()
-        files = sorted(self._iter_certs_dir())
-        for idx, (key_pair_files, key_pair) in enumerate(
-            itertools.zip_longest(itertools.batched(files, 2), key_pairs)
-        ):
-            if key_pair_files is None:
-                self._write_certs_file(self.CERTS_DIR / f"{idx:04}.crt", key_pair.certificate)
-                self._write_certs_file(self.CERTS_DIR / f"{idx:04}.key", key_pair.key)
-                continue
-            if key_pair is None:
-                for file in key_pair_files:
-                    self._unlink_certs_file(file)
-                continue
-            crt_file, key_file = key_pair_files
-            if self._read_certs_file(crt_file) != key_pair.certificate:
-                self._write_certs_file(crt_file, key_pair.certificate)
-            if self._read_certs_file(key_file) != key_pair.key:
-                self._write_certs_file(key_file, key_pair.key)
+        existing = {file.name: file for file in self._iter_certs_dir()}
+        desired = {}
+        for idx, key_pair in enumerate(key_pairs):
+            desired[f"{idx:04}.crt"] = key_pair.certificate
+            desired[f"{idx:04}.key"] = key_pair.key
+        to_write = {
+            name: content
+            for name, content in desired.items()
+            if name not in existing or not self._certs_file_matches(existing[name], content)
+        }
+        to_unlink = [file for name, file in existing.items() if name not in desired]
+        for name, content in to_write.items():
+            self._write_certs_file(self.CERTS_DIR / name, content)
+        for file in to_unlink:
+            self._unlink_certs_file(file)
 
     @staticmethod
     def restart() -> None:
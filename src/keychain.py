@@ -24,6 +24,7 @@ class TlsKeychain:
             namespace: The storage namespace.
         """
         self._namespace = namespace
+        self._storage_dir_created = False
 
     def get_private_key(self) -> str | None:
         """Retrieve the private key from the storage.
@@ -33,13 +34,21 @@ class TlsKeychain:
         """
         return self._get_file_content("private-key.pem")
 
+    def get_private_key_bytes(self) -> bytes | None:
+        """Retrieve the private key from the storage as bytes.
+
+        Returns:
+            The private key as bytes, or None if not found.
+        """
+        return self._get_file_bytes("private-key.pem")
+
     def set_private_key(self, private_key: str) -> None:
         """Store the private key into the storage.
 
         Args:
             private_key: The private key as a string to store.
         """
-        self._storage_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+        self._ensure_storage_dir()
         (self._storage_dir / "private-key.pem").write_text(private_key, encoding="utf-8")
 
     def get_server_name(self) -> str | None:
@@ -56,7 +65,7 @@ class TlsKeychain:
         Args:
             server_name: The server name as a string to store.
         """
-        self._storage_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+        self._ensure_storage_dir()
         (self._storage_dir / "server-name").write_text(server_name, encoding="utf-8")
 
     def get_csr(self) -> str | None:
@@ -67,13 +76,21 @@ class TlsKeychain:
         """
         return self._get_file_content("csr.pem")
 
+    def get_csr_bytes(self) -> bytes | None:
+        """Retrieve the certificate signing request (CSR) from the storage as bytes.
+
+        Returns:
+            The CSR as bytes, or None if not found.
+        """
+        return self._get_file_bytes("csr.pem")
+
     def set_csr(self, csr: str) -> None:
         """Store the certificate signing request (CSR) into the storage.
 
         Args:
             csr: The CSR as a string to store.
         """
-        self._storage_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+        self._ensure_storage_dir()
         (self._storage_dir / "csr.pem").write_text(csr, encoding="utf-8")
 
     def get_chain(self) -> str | None:
@@ -90,7 +107,7 @@ class TlsKeychain:
         Args:
             chain: The certificate chain as a string to store.
         """
-        self._storage_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+        self._ensure_storage_dir()
         (self._storage_dir / "chain.pem").write_text(chain, encoding="utf-8")
 
     def get_key_pairs(self) -> list[TlsKeyPair]:
@@ -120,10 +137,31 @@ class TlsKeychain:
         Returns:
             The content of the file as a string or None if the file does not exist.
         """
-        file = self._storage_dir / filename
-        if file.exists():
-            return file.read_text(encoding="utf-8")
-        return None
+        try:
+            return (self._storage_dir / filename).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def _get_file_bytes(self, filename: str) -> bytes | None:
+        """Retrieve the raw content of a specified file from keychain storage if it exists.
+
+        Args:
+            filename: The name of the file to retrieve.
+
+        Returns:
+            The content of the file as bytes or None if the file does not exist.
+        """
+        try:
+            return (self._storage_dir / filename).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _ensure_storage_dir(self) -> None:
+        """Create the namespaced storage directory, once per TlsKeychain instance."""
+        if self._storage_dir_created:
+            return
+        self._storage_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+        self._storage_dir_created = True
 
     @property
     def _storage_dir(self) -> pathlib.Path:
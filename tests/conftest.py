@@ -5,7 +5,7 @@
 
 import pathlib
 import typing
-from unittest.mock import patch
+from unittest.mock import DEFAULT, patch
 
 import ops.testing
 import pytest
@@ -36,38 +36,45 @@ def mock_chrony_fixture():
         nonlocal mock_config
         mock_config = config
 
-    certs: dict[str, str] = {}
+    certs: dict[pathlib.Path, str] = {}
 
     def _iter_certs_dir():
-        for file in certs:
-            yield pathlib.Path("/etc/chrony/certs") / file
+        return list(certs)
 
     def _write_certs_file(path: pathlib.Path, content: str):
-        certs[path.name] = content
+        certs[path] = content
 
     def _read_certs_file(path: pathlib.Path):
-        return certs[path.name]
+        return certs[path]
+
+    def _get_certs_file_size(path: pathlib.Path) -> int:
+        return len(certs[path].encode("utf-8"))
 
     def _unlink_certs_file(path: pathlib.Path) -> None:
-        del certs[path.name]
-
-    with (
-        patch("chrony.Chrony.install"),
-        patch("chrony.Chrony.restart"),
-        patch("chrony.Chrony.write_config") as mock_write_config,
-        patch("chrony.Chrony.read_config") as mock_read_config,
-        patch("chrony.Chrony._make_certs_dir"),
-        patch("chrony.Chrony._iter_certs_dir") as mock_iter_certs_dir,
-        patch("chrony.Chrony._write_certs_file") as mock_write_certs_file,
-        patch("chrony.Chrony._read_certs_file") as mock_read_certs_file,
-        patch("chrony.Chrony._unlink_certs_file") as mock_unlink_certs_file,
-    ):
-        mock_read_config.side_effect = read_config
-        mock_write_config.side_effect = write_config
-        mock_iter_certs_dir.side_effect = _iter_certs_dir
-        mock_write_certs_file.side_effect = _write_certs_file
-        mock_read_certs_file.side_effect = _read_certs_file
-        mock_unlink_certs_file.side_effect = _unlink_certs_file
+        del certs[path]
+
+    with patch.multiple(
+        "chrony.Chrony",
+        install=DEFAULT,
+        is_installed=DEFAULT,
+        restart=DEFAULT,
+        write_config=DEFAULT,
+        read_config=DEFAULT,
+        _make_certs_dir=DEFAULT,
+        _iter_certs_dir=DEFAULT,
+        _write_certs_file=DEFAULT,
+        _read_certs_file=DEFAULT,
+        _get_certs_file_size=DEFAULT,
+        _unlink_certs_file=DEFAULT,
+    ) as mocks:
+        mocks["is_installed"].return_value = False
+        mocks["read_config"].side_effect = read_config
+        mocks["write_config"].side_effect = write_config
+        mocks["_iter_certs_dir"].side_effect = _iter_certs_dir
+        mocks["_write_certs_file"].side_effect = _write_certs_file
+        mocks["_read_certs_file"].side_effect = _read_certs_file
+        mocks["_get_certs_file_size"].side_effect = _get_certs_file_size
+        mocks["_unlink_certs_file"].side_effect = _unlink_certs_file
 
         yield chrony.Chrony()
 
@@ -3,7 +3,6 @@
 
 """Integration test fixtures."""
 
-import json
 import os.path
 
 import juju.application
@@ -22,30 +21,43 @@ async def chrony_app(
         charm = await ops_test.build_charm(".")
     assert ops_test.model
     charm = await ops_test.model.deploy(os.path.abspath(charm))
-    await ops_test.model.wait_for_idle(timeout=900)
+    await ops_test.model.wait_for_idle(apps=[charm.name], timeout=900)
     return charm
 
 
-@pytest_asyncio.fixture(scope="module")
-async def self_signed_certificates_app(ops_test: OpsTest) -> juju.application.Application:
+@pytest_asyncio.fixture(scope="module", name="self_signed_certificates_app")
+async def self_signed_certificates_app_fixture(ops_test: OpsTest) -> juju.application.Application:
     """Build and deploy the self-signed-certificates charm in the testing model."""
     assert ops_test.model
     charm = await ops_test.model.deploy("self-signed-certificates")
-    await ops_test.model.wait_for_idle(timeout=900)
+    await ops_test.model.wait_for_idle(apps=[charm.name], timeout=900)
     return charm
 
 
+@pytest_asyncio.fixture(scope="module")
+async def ca_cert(self_signed_certificates_app: juju.application.Application) -> str:
+    """Get the CA certificate of the self-signed-certificates charm."""
+    action = await self_signed_certificates_app.units[0].run_action("get-ca-certificate")
+    await action.wait()
+    return action.results["ca-certificate"]
+
+
 @pytest_asyncio.fixture
 async def get_unit_ips(ops_test: OpsTest):
-    """A function to get unit ips of a charm application."""
+    """A function to get unit ips of a charm application.
+
+    Unit addresses are looked up once per application for the duration of a test.
+    """
+    unit_ips: dict[str, list[str]] = {}
 
     async def _get_unit_ips(name: str = "chrony"):
-        _, status, _ = await ops_test.juju("status", "--format", "json")
-        status = json.loads(status)
-        units = status["applications"][name]["units"]
-        ip_list = []
-        for key in sorted(units.keys(), key=lambda n: int(n.split("/")[-1])):
-            ip_list.append(units[key]["public-address"])
-        return ip_list
+        if name not in unit_ips:
+            assert ops_test.model
+            units = ops_test.model.applications[name].units
+            unit_ips[name] = [
+                unit.public_address
+                for unit in sorted(units, key=lambda u: int(u.name.split("/")[-1]))
+            ]
+        return unit_ips[name]
 
     return _get_unit_ips
@@ -3,18 +3,48 @@
 
 """Integration tests."""
 
+import asyncio
 import logging
 import socket
 import ssl
 
 import pytest
 
-from tests.integration.utils import gen_tls_certificate, get_sans, get_tls_certificates
+from tests.integration.utils import (
+    NTP_REQUEST,
+    gen_tls_certificate,
+    get_sans,
+    get_tls_certificates,
+)
 
 logger = logging.getLogger(__name__)
 
 
+async def probe_ntp_servers(hosts: list[str]) -> dict[str, bytes]:
+    """Send a simple NTPv4 request to each NTP server and return the responses by address."""
+    loop = asyncio.get_running_loop()
+    responses: dict[str, bytes] = {}
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as ntp_sock:
+        ntp_sock.setblocking(False)
+        for host in hosts:
+            await loop.sock_sendto(ntp_sock, NTP_REQUEST, (host, 123))
+        async with asyncio.timeout(5):
+            while not responses.keys() >= set(hosts):
+                response, (address, _) = await loop.sock_recvfrom(ntp_sock, 65535)
+                responses[address] = response
+    return responses
+
+
+async def fetch_tls_certificates(hosts: list[str], return_exceptions: bool = False, **kwargs):
+    """Retrieve the TLS certificates from multiple TLS servers concurrently."""
+    return await asyncio.gather(
+        *(asyncio.to_thread(get_tls_certificates, host, **kwargs) for host in hosts),
+        return_exceptions=return_exceptions,
+    )
+
+
 @pytest.mark.abort_on_fail
+@pytest.mark.timeout(900)
 async def test_build_and_deploy(chrony_app, ops_test):
     """
     arrange: set up the chrony charm with a specific NTP source configuration.
@@ -22,7 +52,7 @@ async def test_build_and_deploy(chrony_app, ops_test):
     assert: ensure the application transitions to 'active' status after deployment.
     """
     await chrony_app.set_config({"sources": "ntp://ntp.ubuntu.com"})
-    await ops_test.model.wait_for_idle(status="active")
+    await ops_test.model.wait_for_idle(apps=[chrony_app.name], status="active")
 
 
 @pytest.mark.abort_on_fail
@@ -34,41 +64,42 @@ async def test_ntp_server(get_unit_ips):
     assert: ensure each unit responds correctly to the NTP request.
     """
     unit_ips = await get_unit_ips()
-    for unit_ip in unit_ips:
-        ntp_request = b"\x23" + b"\x00" * 47  # construct a simple NTPv4 request
-        ntp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        ntp_sock.sendto(ntp_request, (unit_ip, 123))
-        assert ntp_sock.recvfrom(65535)[0]
+    responses = await probe_ntp_servers(unit_ips)
+    assert all(responses[unit_ip] for unit_ip in unit_ips)
 
 
+@pytest.mark.timeout(1500)
 async def test_nts_certificates_integration(
-    chrony_app, self_signed_certificates_app, get_unit_ips, ops_test
+    chrony_app, self_signed_certificates_app, ca_cert, get_unit_ips, ops_test
 ):
     """
     arrange: relate with self-signed-certificate application.
     act: update chrony charm config to use different server names.
     assert: confirm that the SANs in the retrieved certificates match configured server name.
     """
-    action = await self_signed_certificates_app.units[0].run_action("get-ca-certificate")
-    await action.wait()
-    ca_cert = action.results["ca-certificate"]
-
     await chrony_app.set_config({"server-name": "example.com", "sources": "ntp://ntp.ubuntu.com"})
     await ops_test.model.add_relation(chrony_app.name, self_signed_certificates_app.name)
-    await ops_test.model.wait_for_idle(status="active")
-    for unit_ip in await get_unit_ips():
-        cert = get_tls_certificates(unit_ip, cadata=ca_cert, server_name="example.com")
+    await ops_test.model.wait_for_idle(
+        apps=[chrony_app.name, self_signed_certificates_app.name], status="active"
+    )
+    unit_ips = await get_unit_ips()
+    for cert in await fetch_tls_certificates(unit_ips, cadata=ca_cert, server_name="example.com"):
         assert sorted(get_sans(cert)) == sorted(["example.com", "*.example.com"])
 
     await chrony_app.set_config({"server-name": "example.net"})
-    await ops_test.model.wait_for_idle(status="active")
-    for unit_ip in await get_unit_ips():
-        cert = get_tls_certificates(unit_ip, cadata=ca_cert, server_name="example.net")
+    await ops_test.model.wait_for_idle(
+        apps=[chrony_app.name, self_signed_certificates_app.name], status="active"
+    )
+    for cert in await fetch_tls_certificates(unit_ips, cadata=ca_cert, server_name="example.net"):
         assert sorted(get_sans(cert)) == sorted(["example.net", "*.example.net"])
-        with pytest.raises(ssl.SSLCertVerificationError):
-            get_tls_certificates(unit_ip, cadata=ca_cert, server_name="example.com")
+    errors = await fetch_tls_certificates(
+        unit_ips, return_exceptions=True, cadata=ca_cert, server_name="example.com"
+    )
+    for error in errors:
+        assert isinstance(error, ssl.SSLCertVerificationError)
 
 
+@pytest.mark.timeout(1500)
 async def test_nts_certificates_configuration(chrony_app, get_unit_ips, ops_test):
     """
     arrange: deploy the chrony charm.
@@ -82,22 +113,23 @@ async def test_nts_certificates_configuration(chrony_app, get_unit_ips, ops_test
     secret_id = secret_id.strip()
     await ops_test.model.grant_secret("test-cert", chrony_app.name)
     await chrony_app.set_config({"nts-certificates": secret_id, "sources": "ntp://ntp.ubuntu.com"})
-    await ops_test.model.wait_for_idle(status="active")
-    for unit_ip in await get_unit_ips():
-        remote_cert = get_tls_certificates(
-            unit_ip, cadata=cert.cert_pem, server_name=cert.server_name
-        )
+    await ops_test.model.wait_for_idle(apps=[chrony_app.name], status="active")
+    unit_ips = await get_unit_ips()
+    remote_certs = await fetch_tls_certificates(
+        unit_ips, cadata=cert.cert_pem, server_name=cert.server_name
+    )
+    for remote_cert in remote_certs:
         assert get_sans(remote_cert) == [cert.server_name]
 
     cert = gen_tls_certificate("config.test.org")
     await ops_test.model.update_secret(
         name="test-cert", data_args=[f"cert={cert.cert_pem}", f"key={cert.key_pem}"]
     )
-    await ops_test.model.wait_for_idle(status="active")
-    for unit_ip in await get_unit_ips():
-        remote_cert = get_tls_certificates(
-            unit_ip, cadata=cert.cert_pem, server_name=cert.server_name
-        )
+    await ops_test.model.wait_for_idle(apps=[chrony_app.name], status="active")
+    remote_certs = await fetch_tls_certificates(
+        unit_ips, cadata=cert.cert_pem, server_name=cert.server_name
+    )
+    for remote_cert in remote_certs:
         assert get_sans(remote_cert) == [cert.server_name]
 
 
@@ -5,6 +5,7 @@
 
 import collections
 import datetime
+import functools
 import socket
 import ssl
 import typing
@@ -15,12 +16,26 @@ import cryptography.hazmat.primitives.serialization
 import cryptography.x509
 import cryptography.x509.oid
 
+NTP_REQUEST = b"\x23" + b"\x00" * 47  # a simple NTPv4 request
 
-def gen_tls_certificate(server_name: str):
-    """Generate a TLS certificate."""
-    private_key = cryptography.hazmat.primitives.asymmetric.ec.generate_private_key(
-        cryptography.hazmat.primitives.asymmetric.ec.SECP256R1()
-    )
+# tests only check the certificate subject, so all generated certificates share one key
+_PRIVATE_KEY = cryptography.hazmat.primitives.asymmetric.ec.generate_private_key(
+    cryptography.hazmat.primitives.asymmetric.ec.SECP256R1()
+)
+_PRIVATE_KEY_PEM = _PRIVATE_KEY.private_bytes(
+    cryptography.hazmat.primitives.serialization.Encoding.PEM,
+    cryptography.hazmat.primitives.serialization.PrivateFormat.PKCS8,
+    cryptography.hazmat.primitives.serialization.NoEncryption(),
+).decode("ascii")
+
+
+Certificate = collections.namedtuple("Certificate", "server_name cert cert_pem key key_pem")
+
+
+@functools.cache
+def gen_tls_certificate(server_name: str) -> Certificate:
+    """Generate a TLS certificate, once per server name."""
+    private_key = _PRIVATE_KEY
     certificate = (
         cryptography.x509.CertificateBuilder()
         .subject_name(
@@ -54,29 +69,30 @@ def gen_tls_certificate(server_name: str):
     cert_pem = certificate.public_bytes(
         cryptography.hazmat.primitives.serialization.Encoding.PEM
     ).decode("ascii")
-    key_pem = private_key.private_bytes(
-        cryptography.hazmat.primitives.serialization.Encoding.PEM,
-        cryptography.hazmat.primitives.serialization.PrivateFormat.PKCS8,
-        cryptography.hazmat.primitives.serialization.NoEncryption(),
-    ).decode("ascii")
-    Certificate = collections.namedtuple("Certificate", "server_name cert cert_pem key key_pem")
     return Certificate(
         server_name=server_name,
         cert=certificate,
         cert_pem=cert_pem,
         key=private_key,
-        key_pem=key_pem,
+        key_pem=_PRIVATE_KEY_PEM,
     )
 
 
-def get_tls_certificates(
-    host, port=4460, server_name=None, verify=True, cadata=None
-) -> cryptography.x509.Certificate:
-    """Retrieve the TLS certificate from a specified TLS server."""
+@functools.lru_cache(maxsize=8)
+def _get_ssl_context(cadata: str | None, verify: bool) -> ssl.SSLContext:
+    """Create a client SSL context, cached to avoid reloading the CA certificates."""
     context = ssl.create_default_context(cadata=cadata)
     if not verify:
         context.check_hostname = False
         context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def get_tls_certificates(
+    host, port=4460, server_name=None, verify=True, cadata=None
+) -> cryptography.x509.Certificate:
+    """Retrieve the TLS certificate from a specified TLS server."""
+    context = _get_ssl_context(cadata=cadata, verify=verify)
     server_name = host if server_name is None else server_name
     with socket.create_connection((host, port)) as sock:
         with context.wrap_socket(sock, server_hostname=server_name) as ssock:
@@ -5,15 +5,27 @@
 
 import json
 
-import cryptography.hazmat.primitives.serialization
 import pytest
 from charms.tls_certificates_interface.v3 import tls_certificates
+from ops.testing import Context
 from scenario import Secret
 
-from tests.utils import TEST_CA_CERT, sign_csr
+from src.charm import ChronyCharm
+from tests.utils import TEST_CA_CERT_PEM, TEST_PRIVATE_KEY_PEM, sign_csr
 
+_CSR_PEM = (
+    tls_certificates.generate_csr(
+        private_key=TEST_PRIVATE_KEY_PEM.encode("ascii"),
+        subject="example.com",
+        sans_dns=["example.com", "*.example.com"],
+    )
+    .decode("ascii")
+    .strip()
+)
+_CERT_PEM = sign_csr(_CSR_PEM).strip()
 
-class Helper:
+
+class Helper:  # pylint: disable=too-many-instance-attributes
     """Scenario test helper."""
 
     def __init__(self, server_name: str, tls_keychain, chrony):
@@ -21,62 +33,46 @@ class Helper:
         self.tls_keychain = tls_keychain
         self.chrony = chrony
         self.server_name = server_name
-        self.ca_cert = (
-            TEST_CA_CERT.public_bytes(cryptography.hazmat.primitives.serialization.Encoding.PEM)
-            .decode("ascii")
-            .strip()
-        )
-        self.csr = (
-            tls_certificates.generate_csr(
-                private_key=tls_keychain.get_private_key().encode(),
-                subject="example.com",
-                sans_dns=["example.com", "*.example.com"],
-            )
-            .decode("ascii")
-            .strip()
-        )
-        self.cert = sign_csr(self.csr).strip()
+        self.ca_cert = TEST_CA_CERT_PEM
+        self.csr = _CSR_PEM
+        self.cert = _CERT_PEM
         self.chain = [self.cert, self.ca_cert]
-
-    def get_local_unit_data(self):
-        """Get simulated local unit data for nts-certificates integration."""
-        return {
+        self._csr_sha256 = tls_certificates.get_sha256_hex(self.csr)
+        self._local_unit_data = {
             "certificate_signing_requests": json.dumps(
                 [{"certificate_signing_request": self.csr, "ca": False}]
             )
         }
+        certificate = {
+            "ca": self.ca_cert,
+            "chain": self.chain,
+            "certificate_signing_request": self.csr,
+            "certificate": self.cert,
+        }
+        self._remote_app_data = {"certificates": json.dumps([certificate])}
+        self._revoked_remote_app_data = {
+            "certificates": json.dumps([{"revoked": True, **certificate}])
+        }
+
+    def get_local_unit_data(self):
+        """Get simulated local unit data for nts-certificates integration."""
+        return dict(self._local_unit_data)
 
     def get_revoked_remote_app_data(self):
         """Get simulated remote app data for nts-certificates integration when provider revoked
         provided certificates.
         """
-        data = self.get_remote_app_data()
-        return {
-            "certificates": json.dumps(
-                [{"revoked": True, **cert} for cert in json.loads(data["certificates"])]
-            )
-        }
+        return dict(self._revoked_remote_app_data)
 
     def get_remote_app_data(self):
         """Get simulated remote app data for nts-certificates integration."""
-        return {
-            "certificates": json.dumps(
-                [
-                    {
-                        "ca": self.ca_cert,
-                        "chain": self.chain,
-                        "certificate_signing_request": self.csr,
-                        "certificate": self.cert,
-                    }
-                ]
-            )
-        }
+        return dict(self._remote_app_data)
 
     def get_tls_certificates_secret(self):
         """Get simulated tls certificates secret created by tls-certificates library."""
         return Secret(
             id="secret:foobar",
-            label=f"{tls_certificates.LIBID}-{tls_certificates.get_sha256_hex(self.csr)}",
+            label=f"{tls_certificates.LIBID}-{self._csr_sha256}",
             tracked_content={"certificate": self.cert, "csr": self.csr},
             owner="unit",
         )
@@ -93,6 +89,15 @@ class Helper:
 
 @pytest.fixture
 def helper(mock_tls_keychain, mock_chrony):
-    """Create scenario test helper and write the private key to TLS keychain."""
-    mock_tls_keychain.set_private_key(tls_certificates.generate_private_key().decode("ascii"))
+    """Create scenario test helper and write the private key to TLS keychain.
+
+    The CSR and certificate are generated once per test session.
+    """
+    mock_tls_keychain.set_private_key(TEST_PRIVATE_KEY_PEM)
     return Helper(server_name="example.com", tls_keychain=mock_tls_keychain, chrony=mock_chrony)
+
+
+@pytest.fixture
+def ctx():
+    """Create a fresh scenario context for each test."""
+    return Context(ChronyCharm)
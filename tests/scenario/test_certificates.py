@@ -2,28 +2,24 @@
 # See LICENSE file for licensing details.
 
 """Scenario tests."""
-import copy
 import json
 import typing
 
 import pytest
-from charms.tls_certificates_interface.v3 import tls_certificates
-from ops.testing import CharmEvents, Context, Relation, Secret, State
+from ops.testing import CharmEvents, Relation, Secret, State
 from scenario.context import _Event  # needed for custom events for now
 
-from src.charm import ChronyCharm
-from tests.utils import get_csr_common_name
+from tests.utils import TEST_PRIVATE_KEY_PEM, get_csr_common_name
 
 
 @pytest.mark.usefixtures("mock_chrony")
-def test_csr_created_after_nts_certificates_integration(mock_tls_keychain):
+def test_csr_created_after_nts_certificates_integration(mock_tls_keychain, ctx):
     """
     arrange: private key is set and a nts-certificates relation is created.
     act: trigger the 'nts-certificates-relation-created' event and handle it.
     assert: check if the CSR data is present in the relation's local unit data.
     """
-    mock_tls_keychain.set_private_key(tls_certificates.generate_private_key().decode("ascii"))
-    ctx = Context(ChronyCharm)
+    mock_tls_keychain.set_private_key(TEST_PRIVATE_KEY_PEM)
     relation = Relation("nts-certificates")
     state_in = State(config={"server-name": "example.com"}, relations=[relation])
 
@@ -35,14 +31,13 @@ def test_csr_created_after_nts_certificates_integration(mock_tls_keychain):
 
 
 @pytest.mark.usefixtures("mock_chrony")
-def test_csr_not_created_if_server_name_unset(mock_tls_keychain):
+def test_csr_not_created_if_server_name_unset(mock_tls_keychain, ctx):
     """
     arrange: without a server-name set in the configuration.
     act: trigger the 'nts-certificates-relation-created' event.
     assert: ensure that no certificate_signing_requests are created due to unset server-name.
     """
-    mock_tls_keychain.set_private_key(tls_certificates.generate_private_key().decode("ascii"))
-    ctx = Context(ChronyCharm)
+    mock_tls_keychain.set_private_key(TEST_PRIVATE_KEY_PEM)
     relation = Relation("nts-certificates")
     state_in = State(relations=[relation])
 
@@ -54,14 +49,13 @@ def test_csr_not_created_if_server_name_unset(mock_tls_keychain):
 
 
 @pytest.mark.usefixtures("mock_chrony")
-def test_csr_created_after_server_name_set(mock_tls_keychain):
+def test_csr_created_after_server_name_set(mock_tls_keychain, ctx):
     """
     arrange: set a server-name and a private key and initialize a nts-certificates integration.
     act: simulate a config-changed event.
     assert: verify that certificate_signing_requests are generated.
     """
-    mock_tls_keychain.set_private_key(tls_certificates.generate_private_key().decode("ascii"))
-    ctx = Context(ChronyCharm)
+    mock_tls_keychain.set_private_key(TEST_PRIVATE_KEY_PEM)
     relation = Relation("nts-certificates")
     state_in = State(config={"server-name": "example.com"}, relations=[relation])
 
@@ -72,7 +66,7 @@ def test_csr_created_after_server_name_set(mock_tls_keychain):
     ]
 
 
-def test_receive_certificate(mock_chrony, helper):
+def test_receive_certificate(mock_chrony, helper, ctx):
     """
     arrange: set server-name, csr, and establish provider side of nts-certificates integration.
     act: handle a 'nts-certificates-relation-changed' event.
@@ -84,7 +78,6 @@ def test_receive_certificate(mock_chrony, helper):
         local_unit_data=helper.get_local_unit_data(),
         remote_app_data=helper.get_remote_app_data(),
     )
-    ctx = Context(ChronyCharm)
     state_in = State(
         config={"server-name": "example.com", "sources": "ntp://example.com"}, relations=[relation]
     )
@@ -97,7 +90,7 @@ def test_receive_certificate(mock_chrony, helper):
     assert "ntsserverkey" in mock_chrony.read_config()
 
 
-def test_server_name_reset_after_certificates(mock_chrony, helper):
+def test_server_name_reset_after_certificates(mock_chrony, helper, ctx):
     """
     arrange: set up a scenario with certificates received from provider.
     act: change configuration settings to an empty server names.
@@ -111,7 +104,6 @@ def test_server_name_reset_after_certificates(mock_chrony, helper):
         remote_app_data=helper.get_remote_app_data(),
     )
     secret = helper.get_tls_certificates_secret()
-    ctx = Context(ChronyCharm)
     state_in = State(
         config={"sources": "ntp://example.com"}, relations=[relation], secrets=[secret]
     )
@@ -127,7 +119,7 @@ def test_server_name_reset_after_certificates(mock_chrony, helper):
     )
 
 
-def test_server_name_change_after_certificate_assigned(mock_chrony, helper):
+def test_server_name_change_after_certificate_assigned(mock_chrony, helper, ctx):
     """
     arrange: set up a scenario with certificates received from provider.
     act: simulate a config-changed event with new different server-name.
@@ -140,7 +132,6 @@ def test_server_name_change_after_certificate_assigned(mock_chrony, helper):
         local_unit_data=helper.get_local_unit_data(),
         remote_app_data=helper.get_remote_app_data(),
     )
-    ctx = Context(ChronyCharm)
     state_in = State(
         config={"sources": "ntp://example.com", "server-name": "example.net"},
         relations=[relation],
@@ -158,7 +149,7 @@ def test_server_name_change_after_certificate_assigned(mock_chrony, helper):
     assert get_csr_common_name(csr[0]["certificate_signing_request"]) == "example.net"
 
 
-def test_server_name_change_before_certificates_assigned(helper):
+def test_server_name_change_before_certificates_assigned(helper, ctx):
     """
     arrange: set up a scenario with CSR created without any certificates assigned.
     act: simulate a config-changed event to update the server-name.
@@ -169,7 +160,6 @@ def test_server_name_change_before_certificates_assigned(helper):
         "nts-certificates",
         local_unit_data=helper.get_local_unit_data(),
     )
-    ctx = Context(ChronyCharm)
     state_in = State(
         config={"sources": "ntp://example.com", "server-name": "example.net"},
         relations=[relation],
@@ -184,7 +174,7 @@ def test_server_name_change_before_certificates_assigned(helper):
     assert get_csr_common_name(csr[0]["certificate_signing_request"]) == "example.net"
 
 
-def test_certificate_expired(monkeypatch, helper):
+def test_certificate_expired(monkeypatch, helper, ctx):
     """
     arrange: set up a scenario with certificates received from provider.
     act: simulate an 'secret-expired' event to trigger the renewal process.
@@ -195,10 +185,9 @@ def test_certificate_expired(monkeypatch, helper):
     local_unit_data = helper.get_local_unit_data()
     relation = Relation(
         "nts-certificates",
-        local_unit_data=copy.deepcopy(local_unit_data),
+        local_unit_data=dict(local_unit_data),
         remote_app_data=helper.get_remote_app_data(),
     )
-    ctx = Context(ChronyCharm)
     secret = helper.get_tls_certificates_secret()
     state_in = State(
         config={"sources": "ntp://example.com", "server-name": "example.net"},
@@ -217,7 +206,7 @@ def test_certificate_expired(monkeypatch, helper):
     )
 
 
-def test_certificate_revoked(helper):
+def test_certificate_revoked(helper, ctx):
     """
     arrange: set up a scenario with certificates received from provider.
     act: simulate a relation change event indicating certificate revocation.
@@ -228,10 +217,9 @@ def test_certificate_revoked(helper):
     local_unit_data = helper.get_local_unit_data()
     relation = Relation(
         "nts-certificates",
-        local_unit_data=copy.deepcopy(local_unit_data),
+        local_unit_data=dict(local_unit_data),
         remote_app_data=helper.get_revoked_remote_app_data(),
     )
-    ctx = Context(ChronyCharm)
     secret = helper.get_tls_certificates_secret()
     state_in = State(
         config={"sources": "ntp://example.com", "server-name": "example.net"},
@@ -249,7 +237,7 @@ def test_certificate_revoked(helper):
     )
 
 
-def test_remove_certificate_integration(mock_chrony, helper):
+def test_remove_certificate_integration(mock_chrony, helper, ctx):
     """
     arrange: set up a scenario with certificates received from provider.
     act: simulate a relation broken event to process certificate removal.
@@ -257,7 +245,6 @@ def test_remove_certificate_integration(mock_chrony, helper):
     """
     helper.write_server_name_and_csr()
     helper.write_chain()
-    ctx = Context(ChronyCharm)
     secret = helper.get_tls_certificates_secret()
     relation = Relation(
         "nts-certificates",
@@ -277,13 +264,12 @@ def test_remove_certificate_integration(mock_chrony, helper):
     assert "ntsserverkey" not in mock_chrony.read_config()
 
 
-def test_nts_certificates_config(helper):
+def test_nts_certificates_config(helper, ctx):
     """
     arrange: create a user provided secret to be set in nts-certificates charm configuration.
     act: process a config-changed event to set nts-certificates charm configuration.
     assert: confirm that the test certificates and keys are correctly used.
     """
-    ctx = Context(ChronyCharm)
     secret_id = "secret:user-provided"
     secret = Secret(
         id=secret_id,
@@ -303,7 +289,7 @@ def test_nts_certificates_config(helper):
     assert helper.chrony.read_tls_key_pairs()[0].key == "test key"
 
 
-def test_nts_certificates_config_with_nts_certificates_integration(helper):
+def test_nts_certificates_config_with_nts_certificates_integration(helper, ctx):
     """
     arrange: set up a scenario with certificates received from nts-certificates integration.
     act: handle a config-changed event to add a new nts-certificates charm configuration.
@@ -317,7 +303,6 @@ def test_nts_certificates_config_with_nts_certificates_integration(helper):
         local_unit_data=local_unit_data,
         remote_app_data=helper.get_remote_app_data(),
     )
-    ctx = Context(ChronyCharm)
     integration_secret = helper.get_tls_certificates_secret()
     config_secret_id = "secret:user-provided"
     config_secret = Secret(
@@ -5,8 +5,12 @@
 
 """Charm unit tests."""
 
+from unittest.mock import patch
+
 import ops.testing
 
+from tests.utils import get_csr_common_name
+
 
 def test_config_time_sources(harness: ops.testing.Harness):
     """
@@ -31,7 +35,7 @@ def test_reconfig_time_sources(harness: ops.testing.Harness):
     assert: verify that the configuration is updated, the old source is removed, the new source is
         added, and the restart method is invoked twice.
     """
-    harness.begin_with_initial_hooks()
+    harness.begin()
     harness.update_config({"sources": "ntp://example.com"})
     assert "pool example.com" in harness.charm.chrony.read_config()
     assert harness.charm.chrony.restart.call_count == 1
@@ -48,9 +52,101 @@ def test_same_time_sources(harness: ops.testing.Harness):
     act: update the configuration with the same time source.
     assert: the time source remains unchanged and the restart method is not invoked again.
     """
-    harness.begin_with_initial_hooks()
+    harness.begin()
     harness.update_config({"sources": "ntp://example.com"})
     assert harness.charm.chrony.restart.call_count == 1
 
     harness.update_config({"sources": "ntp://example.com,"})
     assert harness.charm.chrony.restart.call_count == 1
+
+
+def test_time_sources_with_whitespace(harness: ops.testing.Harness):
+    """
+    arrange: initialize harness.
+    act: set time sources separated by commas surrounded with whitespace.
+    assert: every time source is rendered into the chrony configuration.
+    """
+    harness.begin()
+    harness.update_config({"sources": " ntp://example.com ,ntp://example.net,  "})
+    assert "pool example.com\npool example.net\n" in harness.charm.chrony.read_config()
+
+
+def test_nts_certificates_secret_changed(harness: ops.testing.Harness):
+    """
+    arrange: initialize harness with a user secret set in the nts-certificates configuration.
+    act: update the content of the user secret.
+    assert: the new TLS key pair is written to the chrony certificates directory.
+    """
+    harness.begin()
+    secret_id = harness.add_user_secret({"cert": "cert-1", "key": "key-1"})
+    harness.grant_secret(secret_id, harness.charm.app)
+    harness.update_config({"sources": "ntp://example.com", "nts-certificates": secret_id})
+    assert harness.charm.chrony.read_tls_key_pairs()[0].certificate == "cert-1"
+
+    harness.set_secret_content(secret_id, {"cert": "cert-2", "key": "key-2"})
+    assert harness.charm.chrony.read_tls_key_pairs()[0].certificate == "cert-2"
+
+
+def test_config_changed_unchanged_config(harness: ops.testing.Harness):
+    """
+    arrange: initialize harness and configure a time source.
+    act: emit a config-changed event without changing the charm configuration.
+    assert: the chrony configuration is not read or written again.
+    """
+    harness.begin()
+    harness.update_config({"sources": "ntp://example.com"})
+    read_count = harness.charm.chrony.read_config.call_count
+    write_count = harness.charm.chrony.write_config.call_count
+
+    harness.charm.on.config_changed.emit()
+
+    assert harness.charm.chrony.read_config.call_count == read_count
+    assert harness.charm.chrony.write_config.call_count == write_count
+
+
+def test_upgrade_charm_already_installed(harness: ops.testing.Harness):
+    """
+    arrange: initialize harness with chrony packages reported as installed.
+    act: emit the upgrade-charm event.
+    assert: the package installation is skipped.
+    """
+    harness.begin()
+    with patch("chrony.Chrony.is_installed", return_value=True):
+        harness.charm.on.upgrade_charm.emit()
+    harness.charm.chrony.install.assert_not_called()
+
+
+def test_server_name_changed_twice(harness: ops.testing.Harness):
+    """
+    arrange: initialize harness with a server name and the nts-certificates integration.
+    act: change the server name twice.
+    assert: a new CSR is requested for each new server name.
+    """
+    harness.begin_with_initial_hooks()
+    harness.update_config({"sources": "ntp://example.com", "server-name": "a.example.com"})
+    harness.add_relation("nts-certificates", "self-signed-certificates")
+    assert get_csr_common_name(harness.charm.tls_keychain.get_csr()) == "a.example.com"
+
+    harness.update_config({"server-name": "b.example.com"})
+    assert get_csr_common_name(harness.charm.tls_keychain.get_csr()) == "b.example.com"
+
+    harness.update_config({"server-name": "c.example.com"})
+    assert get_csr_common_name(harness.charm.tls_keychain.get_csr()) == "c.example.com"
+
+
+def test_server_name_removed_and_restored(harness: ops.testing.Harness):
+    """
+    arrange: initialize harness with a server name and the nts-certificates integration.
+    act: remove the server name, then set the same server name again.
+    assert: a new CSR is requested for the restored server name.
+    """
+    harness.begin_with_initial_hooks()
+    harness.update_config({"sources": "ntp://example.com", "server-name": "a.example.com"})
+    harness.add_relation("nts-certificates", "self-signed-certificates")
+    assert get_csr_common_name(harness.charm.tls_keychain.get_csr()) == "a.example.com"
+
+    harness.update_config({"server-name": ""})
+    assert harness.charm.tls_keychain.get_csr() is None
+
+    harness.update_config({"server-name": "a.example.com"})
+    assert get_csr_common_name(harness.charm.tls_keychain.get_csr()) == "a.example.com"
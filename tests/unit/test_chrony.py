@@ -9,29 +9,32 @@ import textwrap
 
 import pytest
 
-from src.chrony import Chrony, TlsKeyPair
-
-TIME_SOURCE_URL_EXAMPLES = [
-    ["ntp://example.com", "pool example.com"],
-    ["ntp://example.com:1234", "pool example.com port 1234"],
-    ["ntp://example.com?iburst=true", "pool example.com iburst"],
-    ["ntp://example.com?iburst=True", "pool example.com iburst"],
-    ["ntp://example.com?iburst=TRUE", "pool example.com iburst"],
-    ["ntp://example.com?iburst=1", "pool example.com iburst"],
-    ["ntp://example.com?iburst=false", "pool example.com"],
-    ["ntp://example.com?iburst=False", "pool example.com"],
-    ["ntp://example.com?iburst=FALSE", "pool example.com"],
-    ["ntp://example.com?iburst=0", "pool example.com"],
-    [
+from src.chrony import Chrony, TlsKeyPair, _read_file, _write_file
+
+TIME_SOURCE_URL_EXAMPLES = (
+    ("ntp://example.com", "pool example.com"),
+    ("ntp://example.com:1234", "pool example.com port 1234"),
+    ("ntp://example.com?iburst=true", "pool example.com iburst"),
+    ("ntp://example.com?iburst=True", "pool example.com iburst"),
+    ("ntp://example.com?iburst=TRUE", "pool example.com iburst"),
+    ("ntp://example.com?iburst=1", "pool example.com iburst"),
+    ("ntp://example.com?iburst=false", "pool example.com"),
+    ("ntp://example.com?iburst=False", "pool example.com"),
+    ("ntp://example.com?iburst=FALSE", "pool example.com"),
+    ("ntp://example.com?iburst=0", "pool example.com"),
+    (
         "ntp://example.com:1234?iburst=true&minpoll=10&polltarget=50",
         "pool example.com port 1234 iburst minpoll 10 polltarget 50",
-    ],
-    ["nts://example.com?require=true&offset=-0.1", "pool example.com nts offset -0.1 require"],
-    ["nts://example.com:4461?require=true", "pool example.com nts ntsport 4461 require"],
-]
+    ),
+    ("nts://example.com?require=true&offset=-0.1", "pool example.com nts offset -0.1 require"),
+    ("nts://example.com:4461?require=true", "pool example.com nts ntsport 4461 require"),
+    ("ntp://[2001:db8::1]:1234", "pool 2001:db8::1 port 1234"),
+)
 
 
-@pytest.mark.parametrize("url,directive", TIME_SOURCE_URL_EXAMPLES)
+@pytest.mark.parametrize(
+    "url,directive", TIME_SOURCE_URL_EXAMPLES, ids=[url for url, _ in TIME_SOURCE_URL_EXAMPLES]
+)
 def test_parse_source_url(url: str, directive: str):
     """
     arrange: receive a list of URL and directory pairs for testing.
@@ -41,12 +44,23 @@ def test_parse_source_url(url: str, directive: str):
     assert Chrony.parse_source_url(url).render() == directive
 
 
-INVALID_TIME_SOURCE_URL_EXAMPLES = [
+INVALID_TIME_SOURCE_URL_EXAMPLES = (
     pytest.param("https://example.com", id="invalid protocol"),
     pytest.param("ntp://", id="no host"),
     pytest.param("ntp://example.com?offset=test", id="incorrect option type"),
     pytest.param("ntp://example.com?foobar=123", id="unknown options"),
-]
+    pytest.param("ntp://example.com:65536", id="port out of range"),
+    pytest.param("nts://example.com:port", id="invalid port"),
+    pytest.param("ntp://example.com:\u0663", id="non-ascii port"),
+    pytest.param("ntp://example.com\nallow all", id="newline in host"),
+    pytest.param("ntp://a\nntp://b", id="missing separator"),
+    pytest.param("ntp://example.com allow", id="whitespace in host"),
+    pytest.param("ntp://a@b@example.com", id="at sign in host"),
+    pytest.param("ntp://example.com?key=a%0Aallow", id="newline in option"),
+    pytest.param("ntp://example.com?port=5", id="port in query"),
+    pytest.param("nts://example.com?ntsport=5", id="ntsport in query"),
+    pytest.param("ntp://example.com?host=evil.org", id="host in query"),
+)
 
 
 @pytest.mark.parametrize("url", INVALID_TIME_SOURCE_URL_EXAMPLES)
@@ -60,6 +74,25 @@ def test_parse_invalid_source_url(url: str):
         Chrony.parse_source_url(url)
 
 
+EXPECTED_CHRONY_CONFIG = textwrap.dedent(
+    """\
+    pool example.com
+    pool nts.example.com nts
+
+    bindcmdaddress 127.0.0.1
+    driftfile /var/lib/chrony/chrony.drift
+    ntsdumpdir /var/lib/chrony
+    logdir /var/log/chrony
+    maxupdateskew 100.0
+    rtcsync
+    makestep 1 3
+    leapsectz right/UTC
+    allow 0.0.0.0/0
+    allow ::/0
+    """
+)
+
+
 def test_render_chrony_config():
     """
     arrange: initialize Chrony object and parse time source URLs.
@@ -68,23 +101,7 @@ def test_render_chrony_config():
     """
     chrony = Chrony()
     sources = [chrony.parse_source_url(s) for s in ["ntp://example.com", "nts://nts.example.com"]]
-    assert chrony.new_config(sources=sources).render() == textwrap.dedent(
-        """\
-        pool example.com
-        pool nts.example.com nts
-
-        bindcmdaddress 127.0.0.1
-        driftfile /var/lib/chrony/chrony.drift
-        ntsdumpdir /var/lib/chrony
-        logdir /var/log/chrony
-        maxupdateskew 100.0
-        rtcsync
-        makestep 1 3
-        leapsectz right/UTC
-        allow 0.0.0.0/0
-        allow ::/0
-        """
-    )
+    assert chrony.new_config(sources=sources).render() == EXPECTED_CHRONY_CONFIG
 
 
 def test_read_write_certs(harness):
@@ -130,6 +147,29 @@ def test_read_write_certs(harness):
         assert chrony.read_tls_key_pairs() == certs
 
 
+EXPECTED_CHRONY_CONFIG_WITH_CERTS = textwrap.dedent(
+    """\
+    pool example.com
+
+    ntsservercert /etc/chrony/certs/0000.crt
+    ntsserverkey /etc/chrony/certs/0000.key
+    ntsservercert /etc/chrony/certs/0001.crt
+    ntsserverkey /etc/chrony/certs/0001.key
+
+    bindcmdaddress 127.0.0.1
+    driftfile /var/lib/chrony/chrony.drift
+    ntsdumpdir /var/lib/chrony
+    logdir /var/log/chrony
+    maxupdateskew 100.0
+    rtcsync
+    makestep 1 3
+    leapsectz right/UTC
+    allow 0.0.0.0/0
+    allow ::/0
+    """
+)
+
+
 def test_render_chrony_config_with_certs():
     """
     arrange: initialize Chrony object and parse time source URLs.
@@ -142,24 +182,90 @@ def test_render_chrony_config_with_certs():
         TlsKeyPair(certificate="1-cert", key="1-key"),
         TlsKeyPair(certificate="2-cert", key="2-key"),
     ]
-    assert chrony.new_config(sources=sources, tls_key_pairs=certs).render() == textwrap.dedent(
-        """\
-        pool example.com
-
-        ntsservercert /etc/chrony/certs/0000.crt
-        ntsserverkey /etc/chrony/certs/0000.key
-        ntsservercert /etc/chrony/certs/0001.crt
-        ntsserverkey /etc/chrony/certs/0001.key
-
-        bindcmdaddress 127.0.0.1
-        driftfile /var/lib/chrony/chrony.drift
-        ntsdumpdir /var/lib/chrony
-        logdir /var/log/chrony
-        maxupdateskew 100.0
-        rtcsync
-        makestep 1 3
-        leapsectz right/UTC
-        allow 0.0.0.0/0
-        allow ::/0
-        """
+    rendered = chrony.new_config(sources=sources, tls_key_pairs=certs).render()
+    assert rendered == EXPECTED_CHRONY_CONFIG_WITH_CERTS
+
+
+def test_tls_key_pairs_differ(harness):
+    """
+    arrange: initialize harness and write a TLS key pair into the certificates directory.
+    act: compare the certificates directory with different lists of TLS key pairs.
+    assert: only the identical list of TLS key pairs is reported as not different.
+    """
+    harness.begin()
+    chrony = harness.charm.chrony
+    chrony.write_tls_key_pairs([TlsKeyPair(certificate="1-cert", key="1-key")])
+
+    assert not chrony.tls_key_pairs_differ([TlsKeyPair(certificate="1-cert", key="1-key")])
+    assert chrony.tls_key_pairs_differ([])
+    assert chrony.tls_key_pairs_differ([TlsKeyPair(certificate="1-cert", key="2-key")])
+    assert chrony.tls_key_pairs_differ([TlsKeyPair(certificate="2-cert", key="1-key")])
+    assert chrony.tls_key_pairs_differ(
+        [
+            TlsKeyPair(certificate="1-cert", key="1-key"),
+            TlsKeyPair(certificate="2-cert", key="2-key"),
+        ]
     )
+
+
+def test_tls_key_pairs_differ_file_names(harness):
+    """
+    arrange: initialize harness and write TLS key pairs under non-consecutive indexed file names.
+    act: compare the certificates directory with TLS key pairs of the same content.
+    assert: the TLS key pairs are reported as different.
+    """
+    harness.begin()
+    chrony = harness.charm.chrony
+    key_pairs = [
+        TlsKeyPair(certificate="1-cert", key="1-key"),
+        TlsKeyPair(certificate="2-cert", key="2-key"),
+    ]
+    for name, content in (
+        ("0000.crt", "1-cert"),
+        ("0000.key", "1-key"),
+        ("0002.crt", "2-cert"),
+        ("0002.key", "2-key"),
+    ):
+        chrony._write_certs_file(  # pylint: disable=protected-access
+            Chrony.CERTS_DIR / name, content
+        )
+
+    assert chrony.tls_key_pairs_differ(key_pairs)
+    chrony.write_tls_key_pairs(key_pairs)
+    assert not chrony.tls_key_pairs_differ(key_pairs)
+
+
+@pytest.mark.parametrize("content", ["", "pool example.com\n", "x" * 100000])
+def test_read_write_file(tmp_path, content: str):
+    """
+    arrange: create a file path in a temporary directory.
+    act: write a longer content to the file, then overwrite it with the given content.
+    assert: reading the file gives the given content and the file keeps its initial mode.
+    """
+    path = tmp_path / "file"
+    _write_file(path, "previous content" * 10000, mode=0o600)
+    _write_file(path, content, mode=0o644)
+    assert _read_file(path) == content
+    assert path.stat().st_mode & 0o777 == 0o600
+
+
+def test_apply_same_config_twice(harness):
+    """
+    arrange: initialize harness and apply a chrony configuration.
+    act: apply a new configuration object with the same time sources and TLS key pairs.
+    assert: the chrony configuration is not read again and chrony is not restarted again.
+    """
+    harness.begin()
+    chrony = harness.charm.chrony
+    sources = [chrony.parse_source_url("ntp://example.com")]
+    key_pairs = [TlsKeyPair(certificate="cert", key="key")]
+    chrony.new_config(sources=sources, tls_key_pairs=key_pairs).apply()
+    read_count = chrony.read_config.call_count
+    restart_count = chrony.restart.call_count
+
+    sources = [chrony.parse_source_url("ntp://example.com")]
+    key_pairs = [TlsKeyPair(certificate="cert", key="key")]
+    chrony.new_config(sources=sources, tls_key_pairs=key_pairs).apply()
+
+    assert chrony.read_config.call_count == read_count
+    assert chrony.restart.call_count == restart_count
@@ -5,41 +5,39 @@
 
 """Chrony unit tests."""
 
-
-def test_keychain_private_key(mock_tls_keychain):
-    """
-    arrange: mock filesystem operations in TlsKeychain.
-    act: write a private key to the given TlsKeychain.
-    assert: read the private key from the given TlsKeychain gives the same private key.
-    """
-    assert mock_tls_keychain.get_private_key() is None
-    mock_tls_keychain.set_private_key("foobar")
-    assert mock_tls_keychain.get_private_key() == "foobar"
-    mock_tls_keychain.set_private_key("test")
-    assert mock_tls_keychain.get_private_key() == "test"
-
-
-def test_keychain_server_name(mock_tls_keychain):
+import pytest
+
+
+@pytest.mark.parametrize(
+    "setter,getter",
+    [
+        pytest.param("set_private_key", "get_private_key", id="private key"),
+        pytest.param("set_server_name", "get_server_name", id="server name"),
+        pytest.param("set_chain", "get_chain", id="certificate chain"),
+    ],
+)
+def test_keychain_round_trip(mock_tls_keychain, setter: str, getter: str):
     """
     arrange: mock filesystem operations in TlsKeychain.
-    act: write the server name to the given TlsKeychain.
-    assert: read the server name from the given TlsKeychain gives the same server name.
+    act: write a value to the given TlsKeychain through the setter.
+    assert: read the value from the given TlsKeychain through the getter gives the same value.
     """
-    assert mock_tls_keychain.get_server_name() is None
-    mock_tls_keychain.set_server_name("foobar")
-    assert mock_tls_keychain.get_server_name() == "foobar"
-    mock_tls_keychain.set_server_name("test")
-    assert mock_tls_keychain.get_server_name() == "test"
+    assert getattr(mock_tls_keychain, getter)() is None
+    getattr(mock_tls_keychain, setter)("foobar")
+    assert getattr(mock_tls_keychain, getter)() == "foobar"
+    getattr(mock_tls_keychain, setter)("test")
+    assert getattr(mock_tls_keychain, getter)() == "test"
 
 
-def test_keychain_chain(mock_tls_keychain):
+def test_keychain_bytes_accessors(mock_tls_keychain):
     """
     arrange: mock filesystem operations in TlsKeychain.
-    act: write the certificate chain to the given TlsKeychain.
-    assert: read the certificate chain from the given TlsKeychain gives the same certificate chain.
+    act: write a private key and a CSR to the given TlsKeychain.
+    assert: the bytes accessors return the same content encoded as bytes.
     """
-    assert mock_tls_keychain.get_chain() is None
-    mock_tls_keychain.set_chain("foobar")
-    assert mock_tls_keychain.get_chain() == "foobar"
-    mock_tls_keychain.set_chain("test")
-    assert mock_tls_keychain.get_chain() == "test"
+    assert mock_tls_keychain.get_private_key_bytes() is None
+    assert mock_tls_keychain.get_csr_bytes() is None
+    mock_tls_keychain.set_private_key("private-key")
+    mock_tls_keychain.set_csr("csr")
+    assert mock_tls_keychain.get_private_key_bytes() == b"private-key"
+    assert mock_tls_keychain.get_csr_bytes() == b"csr"